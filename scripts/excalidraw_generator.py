@@ -15,14 +15,36 @@ Usage:
     d.save("my_diagram.excalidraw")
 """
 
+import array
+import functools
 import json
+import os
 import random
 import math
-import uuid
-from dataclasses import dataclass, field
-from typing import Optional, Literal, Any, Union, List
+from types import MappingProxyType
+from typing import Optional, Literal, Any, Union, List, Mapping, Sequence
 from pathlib import Path
 
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:  # optional accelerator; stdlib json is the fallback
+    orjson = None
+    _HAS_ORJSON = False
+
+try:
+    import msgspec
+except ImportError:  # only needed for the msgpack interchange format
+    msgspec = None
+
+
+def _encode_default(obj: Any) -> Any:
+    # orjson and msgspec reject float subclasses (e.g. numpy.float64) that the
+    # stdlib encoder writes as floats
+    if isinstance(obj, float):
+        return float(obj)
+    raise TypeError(f"Type is not serializable: {type(obj).__name__}")
+
 
 # ============================================================================
 # Constants (from Excalidraw source)
@@ -49,7 +71,7 @@ STROKE_STYLE = {"solid": "solid", "dashed": "dashed", "dotted": "dotted"}
 
 ROUNDNESS = {
     "sharp": None,
-    "round": {"type": 3},  # Adaptive radius
+    "round": MappingProxyType({"type": 3}),  # Adaptive radius (read-only)
 }
 
 ARROWHEADS = {
@@ -109,18 +131,109 @@ BG_FOR_STROKE = {
     "black": "transparent",
 }
 
+# Palette name -> (stroke hex, background hex when filled), resolved once
+_RESOLVED = {
+    name: (COLORS[name], COLORS.get(BG_FOR_STROKE.get(name, "transparent"), "transparent"))
+    for name in COLORS
+}
+
+
+def _resolve_color(color: str) -> tuple:
+    """(stroke, filled background) for a palette name or raw color value."""
+    resolved = _RESOLVED.get(color)
+    if resolved is None:
+        # Raw values and palette entries added to COLORS at runtime
+        resolved = (
+            COLORS.get(color, color),
+            COLORS.get(BG_FOR_STROKE.get(color, "transparent"), "transparent"),
+        )
+    return resolved
+
 
 # ============================================================================
 # Element Classes
 # ============================================================================
 
+# IDs and seeds are drawn from pools refilled with one entropy read per
+# batch, instead of one os.urandom()/RNG call per value. Setting
+# EXCALIDRAW_SEED switches the source to a seeded PRNG, which makes the
+# generated IDs and seeds (and so the output files) reproducible.
+_ID_POOL_SIZE = 1024
+_SEED_POOL_SIZE = 4096
+_id_pool: List[str] = []
+_seed_pool: List[int] = []
+_seeded_rng = (
+    random.Random(os.environ["EXCALIDRAW_SEED"]) if os.environ.get("EXCALIDRAW_SEED") else None
+)
+
+def _random_bytes(n: int) -> bytes:
+    if _seeded_rng is not None:
+        return _seeded_rng.getrandbits(n * 8).to_bytes(n, "little")
+    return os.urandom(n)
+
+def _refill_id_pool() -> None:
+    raw = _random_bytes(10 * _ID_POOL_SIZE).hex()
+    _id_pool.extend([raw[i:i + 20] for i in range(0, len(raw), 20)])
+
+def _refill_seed_pool() -> None:
+    raw = array.array("I")
+    raw.frombytes(_random_bytes(_SEED_POOL_SIZE * raw.itemsize))
+    _seed_pool.extend([v % 2_000_000_000 + 1 for v in raw])
+
+def _clear_pools() -> None:
+    del _id_pool[:]
+    del _seed_pool[:]
+
+# A forked child would otherwise hand out the same pooled IDs as its parent
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clear_pools)
+
 def _gen_id() -> str:
-    """Generate a unique element ID."""
-    return str(uuid.uuid4())[:20].replace("-", "")
+    """Generate a unique element ID (20 hex chars)."""
+    try:
+        return _id_pool.pop()
+    except IndexError:
+        _refill_id_pool()
+        return _id_pool.pop()
 
 def _gen_seed() -> int:
-    """Generate a random seed for roughjs rendering."""
-    return random.randint(1, 2_000_000_000)
+    """Generate a random seed (1..2_000_000_000) for roughjs rendering."""
+    try:
+        return _seed_pool.pop()
+    except IndexError:
+        _refill_seed_pool()
+        return _seed_pool.pop()
+
+# Defaults shared by every element; _base_element copies this and fills in
+# the per-element fields.
+_BASE_TEMPLATE = {
+    "id": None,
+    "type": None,
+    "x": 0,
+    "y": 0,
+    "width": 0,
+    "height": 0,
+    "angle": 0,
+    "strokeColor": "#1e1e1e",
+    "backgroundColor": "transparent",
+    "fillStyle": "solid",
+    "strokeWidth": 2,
+    "strokeStyle": "solid",
+    "roughness": 1,
+    "opacity": 100,
+    "seed": 0,
+    "version": 1,
+    "versionNonce": 0,
+    "index": None,
+    "isDeleted": False,
+    "groupIds": None,
+    "frameId": None,
+    "boundElements": None,
+    "updated": 1,
+    "link": None,
+    "locked": False,
+    "roundness": None,
+}
 
 def _base_element(
     elem_type: str,
@@ -136,37 +249,85 @@ def _base_element(
     roughness: int = 1,
     opacity: int = 100,
     angle: float = 0,
-    roundness: Optional[dict] = None,
+    roundness: Optional[Mapping[str, Any]] = None,
 ) -> dict:
     """Create a base element with common properties."""
-    return {
-        "id": _gen_id(),
-        "type": elem_type,
-        "x": x,
-        "y": y,
-        "width": width,
-        "height": height,
-        "angle": angle,
-        "strokeColor": stroke_color,
-        "backgroundColor": bg_color,
-        "fillStyle": fill_style,
-        "strokeWidth": stroke_width,
-        "strokeStyle": stroke_style,
-        "roughness": roughness,
-        "opacity": opacity,
-        "seed": _gen_seed(),
-        "version": 1,
-        "versionNonce": _gen_seed(),
-        "index": None,
-        "isDeleted": False,
-        "groupIds": [],
-        "frameId": None,
-        "boundElements": None,
-        "updated": 1,
-        "link": None,
-        "locked": False,
-        "roundness": roundness,
-    }
+    elem = _BASE_TEMPLATE.copy()
+    elem["id"] = _gen_id()
+    elem["type"] = elem_type
+    elem["x"] = x
+    elem["y"] = y
+    elem["width"] = width
+    elem["height"] = height
+    elem["angle"] = angle
+    elem["strokeColor"] = stroke_color
+    elem["backgroundColor"] = bg_color
+    elem["fillStyle"] = fill_style
+    elem["strokeWidth"] = stroke_width
+    elem["strokeStyle"] = stroke_style
+    elem["roughness"] = roughness
+    elem["opacity"] = opacity
+    elem["seed"] = _gen_seed()
+    elem["versionNonce"] = _gen_seed()
+    elem["groupIds"] = []  # must not be shared between elements
+    # Each element gets its own roundness dict: a shared one would let an edit
+    # to one element leak into every other, and ROUNDNESS entries are read-only
+    # proxies that json cannot serialize.
+    elem["roundness"] = dict(roundness) if roundness is not None else None
+    return elem
+
+
+@functools.lru_cache(maxsize=256)
+def _shape_template(elem_type: str, color: str, fill: bool, rounded: bool) -> dict:
+    """Style defaults for a shape; callers must copy, never mutate, the result.
+
+    Only called for colors in _RESOLVED, so runtime palette additions are
+    never frozen into the cache.
+    """
+    stroke, fill_bg = _RESOLVED[color]
+    elem = _BASE_TEMPLATE.copy()
+    elem["type"] = elem_type
+    elem["strokeColor"] = stroke
+    elem["backgroundColor"] = fill_bg if fill else "transparent"
+    elem["roundness"] = ROUNDNESS["round"] if rounded else ROUNDNESS["sharp"]
+    return elem
+
+
+def _shape_element(
+    elem_type: str,
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+    color: str,
+    fill: bool,
+    rounded: bool,
+    kwargs: dict,
+) -> dict:
+    """Build a rectangle/ellipse/diamond, from the cached template if no overrides."""
+    if kwargs or color not in _RESOLVED:
+        stroke, fill_bg = _resolve_color(color)
+        # An explicit roundness= (e.g. on ellipse/diamond) overrides the default
+        kwargs.setdefault("roundness", ROUNDNESS["round"] if rounded else ROUNDNESS["sharp"])
+        return _base_element(
+            elem_type, x, y, width, height,
+            stroke_color=stroke,
+            bg_color=fill_bg if fill else "transparent",
+            **kwargs
+        )
+    elem = _shape_template(elem_type, color, fill, rounded).copy()
+    elem["id"] = _gen_id()
+    elem["x"] = x
+    elem["y"] = y
+    elem["width"] = width
+    elem["height"] = height
+    elem["seed"] = _gen_seed()
+    elem["versionNonce"] = _gen_seed()
+    elem["groupIds"] = []
+    roundness = elem["roundness"]
+    if roundness is not None:
+        elem["roundness"] = dict(roundness)
+    return elem
 
 
 def rectangle(
@@ -180,17 +341,7 @@ def rectangle(
     **kwargs
 ) -> dict:
     """Create a rectangle element."""
-    stroke = COLORS.get(color, color)
-    bg = COLORS.get(BG_FOR_STROKE.get(color, "transparent"), "transparent") if fill else "transparent"
-
-    elem = _base_element(
-        "rectangle", x, y, width, height,
-        stroke_color=stroke,
-        bg_color=bg,
-        roundness=ROUNDNESS["round"] if rounded else ROUNDNESS["sharp"],
-        **kwargs
-    )
-    return elem
+    return _shape_element("rectangle", x, y, width, height, color, fill, rounded, kwargs)
 
 
 def ellipse(
@@ -203,16 +354,7 @@ def ellipse(
     **kwargs
 ) -> dict:
     """Create an ellipse element."""
-    stroke = COLORS.get(color, color)
-    bg = COLORS.get(BG_FOR_STROKE.get(color, "transparent"), "transparent") if fill else "transparent"
-
-    elem = _base_element(
-        "ellipse", x, y, width, height,
-        stroke_color=stroke,
-        bg_color=bg,
-        **kwargs
-    )
-    return elem
+    return _shape_element("ellipse", x, y, width, height, color, fill, False, kwargs)
 
 
 def diamond(
@@ -225,16 +367,7 @@ def diamond(
     **kwargs
 ) -> dict:
     """Create a diamond element."""
-    stroke = COLORS.get(color, color)
-    bg = COLORS.get(BG_FOR_STROKE.get(color, "transparent"), "transparent") if fill else "transparent"
-
-    elem = _base_element(
-        "diamond", x, y, width, height,
-        stroke_color=stroke,
-        bg_color=bg,
-        **kwargs
-    )
-    return elem
+    return _shape_element("diamond", x, y, width, height, color, fill, False, kwargs)
 
 
 def text(
@@ -253,10 +386,31 @@ def text(
 
     # Estimate dimensions based on content
     lines = content.split("\n")
-    max_line_len = max(len(line) for line in lines)
+    max_line_len = max(map(len, lines))
     width = max_line_len * font_size * 0.6
     height = len(lines) * font_size * 1.35
 
+    return _text_element(
+        x, y, width, height, content, font_size, ff, stroke,
+        TEXT_ALIGN.get(align, "center"), "top", None, **kwargs
+    )
+
+
+def _text_element(
+    x: float,
+    y: float,
+    width: float,
+    height: float,
+    content: str,
+    font_size: int,
+    font_family_id: int,
+    stroke: str,
+    align: str,
+    vertical_align: str,
+    container_id: Optional[str],
+    **kwargs
+) -> dict:
+    """Build a text element with already-resolved geometry and style."""
     elem = _base_element(
         "text", x, y, width, height,
         stroke_color=stroke,
@@ -265,11 +419,11 @@ def text(
     )
     elem.update({
         "fontSize": font_size,
-        "fontFamily": ff,
+        "fontFamily": font_family_id,
         "text": content,
-        "textAlign": TEXT_ALIGN.get(align, "center"),
-        "verticalAlign": "top",
-        "containerId": None,
+        "textAlign": align,
+        "verticalAlign": vertical_align,
+        "containerId": container_id,
         "originalText": content,
         "autoResize": True,
         "lineHeight": 1.25,
@@ -357,18 +511,135 @@ def line(
 # Diagram Class - High-Level API
 # ============================================================================
 
-@dataclass
+_SHAPE_FUNCS = {
+    "rectangle": rectangle,
+    "ellipse": ellipse,
+    "diamond": diamond,
+}
+
+
+def _labeled_shape(
+    x: float,
+    y: float,
+    label: str,
+    width: float,
+    height: float,
+    color: str,
+    shape: str,
+    font_size: int,
+) -> tuple:
+    """Create a shape and its bound label text. Returns (shape, text)."""
+    shape_elem = _SHAPE_FUNCS[shape](x, y, width, height, color=color)
+
+    # Text fills the shape and is centered by Excalidraw via containerId
+    text_elem = _text_element(
+        x, y, width, height, label, font_size, FONT_FAMILY["hand"],
+        COLORS.get(color, color), "center", "middle", shape_elem["id"],
+    )
+
+    # Link text to shape
+    shape_elem["boundElements"] = [{"id": text_elem["id"], "type": "text"}]
+    return shape_elem, text_elem
+
+
+# (horizontal, dx > 0, dy > 0) bits -> (from_side, to_side) for auto routing.
+# Horizontal connections only depend on dx, vertical ones only on dy.
+_AUTO_SIDES = {
+    0b000: ("top", "bottom"),
+    0b001: ("bottom", "top"),
+    0b010: ("top", "bottom"),
+    0b011: ("bottom", "top"),
+    0b100: ("left", "right"),
+    0b101: ("left", "right"),
+    0b110: ("right", "left"),
+    0b111: ("right", "left"),
+}
+
+
+def _connection_points(
+    source: "Element",
+    target: "Element",
+    from_side: str = "auto",
+    to_side: str = "auto",
+) -> tuple:
+    """Compute arrow endpoints between two elements. Returns (sx, sy, ex, ey)."""
+    # Determine connection points
+    if from_side == "auto" and to_side == "auto":
+        # Auto-detect best sides based on relative position
+        dx = target.center_x - source.center_x
+        dy = target.center_y - source.center_y
+        key = ((abs(dx) > abs(dy)) << 2) | ((dx > 0) << 1) | (dy > 0)
+        from_side, to_side = _AUTO_SIDES[key]
+
+    # Get start point
+    if from_side == "right":
+        sx, sy = source.right, source.center_y
+    elif from_side == "left":
+        sx, sy = source.left, source.center_y
+    elif from_side == "bottom":
+        sx, sy = source.center_x, source.bottom
+    else:  # top
+        sx, sy = source.center_x, source.top
+
+    # Get end point
+    if to_side == "left":
+        ex, ey = target.left, target.center_y
+    elif to_side == "right":
+        ex, ey = target.right, target.center_y
+    elif to_side == "top":
+        ex, ey = target.center_x, target.top
+    else:  # bottom
+        ex, ey = target.center_x, target.bottom
+
+    return sx, sy, ex, ey
+
+
+def _per_item(value: Any, n: int) -> list:
+    """Broadcast a scalar to ``n`` items, or validate a per-item sequence."""
+    if isinstance(value, (str, bytes)) or not hasattr(value, "__len__"):
+        return [value] * n
+    if len(value) != n:
+        raise ValueError(f"expected {n} values, got {len(value)}")
+    return list(value)
+
+
 class Element:
     """Wrapper for element with position tracking."""
-    data: dict
-    x: float
-    y: float
-    width: float
-    height: float
-    id: str = ""
 
-    def __post_init__(self):
-        self.id = self.data.get("id", "")
+    # A plain slotted class rather than a dataclass: diagrams create one per
+    # box, and slots avoid a per-instance __dict__.
+    __slots__ = ("data", "x", "y", "width", "height", "id")
+
+    def __init__(
+        self,
+        data: dict,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+        id: str = "",
+    ):
+        self.data = data
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.id = id or data.get("id", "")
+
+    def __repr__(self) -> str:
+        return (
+            f"Element(data={self.data!r}, x={self.x!r}, y={self.y!r}, "
+            f"width={self.width!r}, height={self.height!r}, id={self.id!r})"
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Element):
+            return NotImplemented
+        return (self.data, self.x, self.y, self.width, self.height, self.id) == (
+            other.data, other.x, other.y, other.width, other.height, other.id
+        )
+
+    __hash__ = None
 
     @property
     def center_x(self) -> float:
@@ -401,14 +672,59 @@ class Diagram:
     def __init__(self, background: str = "#ffffff"):
         self.elements: List[dict] = []
         self.background = background
+        # Element id -> position in self.elements, kept in step by _append()
+        self._index: dict[str, int] = {}
+        # Element handles returned to callers, so translate() keeps them valid
+        self._handles: List[Element] = []
+
+    def _append(self, elem: dict) -> None:
+        self._index[elem.get("id")] = len(self.elements)
+        self.elements.append(elem)
+
+    def _extend(self, elems: List[dict]) -> None:
+        for elem in elems:
+            self._append(elem)
+
+    @classmethod
+    def from_node_edge_arrays(
+        cls,
+        xs: Sequence[float],
+        ys: Sequence[float],
+        labels: Sequence[str],
+        colors: Union[str, Sequence[str]] = "blue",
+        shapes: Union[str, Sequence[str]] = "rectangle",
+        edges_from: Sequence[int] = (),
+        edges_to: Sequence[int] = (),
+        edge_labels: Optional[Sequence[Optional[str]]] = None,
+        **kwargs
+    ) -> "Diagram":
+        """Build a diagram from parallel node arrays and index-based edges.
+
+        Node ``i`` is a box at ``(xs[i], ys[i])``; edge ``j`` is an arrow from
+        node ``edges_from[j]`` to node ``edges_to[j]``. Extra keyword
+        arguments go to the constructor.
+        """
+        d = cls(**kwargs)
+        nodes = d.boxes(xs, ys, labels, color=colors, shape=shapes)
+        d.arrows_between(
+            [nodes[i] for i in edges_from],
+            [nodes[i] for i in edges_to],
+            labels=edge_labels,
+        )
+        return d
+
+    def _handle(self, data: dict, x: float, y: float, width: float, height: float) -> Element:
+        elem = Element(data, x, y, width, height)
+        self._handles.append(elem)
+        return elem
 
     def add(self, *elements: Union[dict, List[dict]]) -> None:
         """Add raw elements to the diagram."""
         for elem in elements:
             if isinstance(elem, list):
-                self.elements.extend(elem)
+                self._extend(elem)
             else:
-                self.elements.append(elem)
+                self._append(elem)
 
     def box(
         self,
@@ -422,31 +738,53 @@ class Diagram:
         font_size: int = 18,
     ) -> Element:
         """Create a labeled box (rectangle, ellipse, or diamond)."""
-        shape_funcs = {
-            "rectangle": rectangle,
-            "ellipse": ellipse,
-            "diamond": diamond,
-        }
-        shape_elem = shape_funcs[shape](x, y, width, height, color=color)
-
-        # Add centered text
-        text_x = x + width / 2 - len(label) * font_size * 0.3
-        text_y = y + height / 2 - font_size / 2
-        text_elem = text(text_x, text_y, label, font_size=font_size, color=color)
-
-        # Link text to shape
-        shape_elem["boundElements"] = [{"id": text_elem["id"], "type": "text"}]
-        text_elem["containerId"] = shape_elem["id"]
-        text_elem["textAlign"] = "center"
-        text_elem["verticalAlign"] = "middle"
-        # Position text at shape center
-        text_elem["x"] = x
-        text_elem["y"] = y
-        text_elem["width"] = width
-        text_elem["height"] = height
-
-        self.elements.extend([shape_elem, text_elem])
-        return Element(shape_elem, x, y, width, height)
+        shape_elem, text_elem = _labeled_shape(
+            x, y, label, width, height, color, shape, font_size
+        )
+        self._extend([shape_elem, text_elem])
+        return self._handle(shape_elem, x, y, width, height)
+
+    def boxes(
+        self,
+        xs: Sequence[float],
+        ys: Sequence[float],
+        labels: Sequence[str],
+        widths: Union[float, Sequence[float]] = 150,
+        heights: Union[float, Sequence[float]] = 60,
+        color: Union[str, Sequence[str]] = "blue",
+        shape: Union[str, Sequence[str]] = "rectangle",
+        font_size: int = 18,
+    ) -> List[Element]:
+        """Create many labeled boxes in one call.
+
+        ``xs``, ``ys`` and ``labels`` are parallel sequences (lists or
+        tuples). Values are stored as given: NumPy integers only serialize
+        through orjson, not the stdlib JSON fallback or to_msgpack(), so pass
+        plain Python numbers (e.g. ``arr.tolist()``). ``widths``, ``heights``,
+        ``color`` and ``shape`` may be a single value or one per box.
+        Returns the boxes in input order.
+        """
+        n = len(labels)
+        if len(xs) != n or len(ys) != n:
+            raise ValueError("xs, ys and labels must have the same length")
+        widths = _per_item(widths, n)
+        heights = _per_item(heights, n)
+        colors = _per_item(color, n)
+        shapes = _per_item(shape, n)
+
+        new_elements = []
+        result = []
+        for x, y, label, width, height, color, shape in zip(
+            xs, ys, labels, widths, heights, colors, shapes
+        ):
+            shape_elem, text_elem = _labeled_shape(
+                x, y, label, width, height, color, shape, font_size
+            )
+            new_elements.append(shape_elem)
+            new_elements.append(text_elem)
+            result.append(self._handle(shape_elem, x, y, width, height))
+        self._extend(new_elements)
+        return result
 
     def text_box(
         self,
@@ -458,8 +796,8 @@ class Diagram:
     ) -> Element:
         """Create a standalone text element."""
         elem = text(x, y, content, font_size=font_size, color=color)
-        self.elements.append(elem)
-        return Element(elem, x, y, elem["width"], elem["height"])
+        self._append(elem)
+        return self._handle(elem, x, y, elem["width"], elem["height"])
 
     def arrow_between(
         self,
@@ -471,43 +809,30 @@ class Diagram:
         to_side: Literal["left", "top", "right", "bottom", "auto"] = "auto",
     ) -> None:
         """Draw an arrow between two elements."""
-        # Determine connection points
-        if from_side == "auto" and to_side == "auto":
-            # Auto-detect best sides based on relative position
-            dx = target.center_x - source.center_x
-            dy = target.center_y - source.center_y
-
-            if abs(dx) > abs(dy):
-                # Horizontal connection
-                from_side = "right" if dx > 0 else "left"
-                to_side = "left" if dx > 0 else "right"
-            else:
-                # Vertical connection
-                from_side = "bottom" if dy > 0 else "top"
-                to_side = "top" if dy > 0 else "bottom"
-
-        # Get start point
-        if from_side == "right":
-            sx, sy = source.right, source.center_y
-        elif from_side == "left":
-            sx, sy = source.left, source.center_y
-        elif from_side == "bottom":
-            sx, sy = source.center_x, source.bottom
-        else:  # top
-            sx, sy = source.center_x, source.top
-
-        # Get end point
-        if to_side == "left":
-            ex, ey = target.left, target.center_y
-        elif to_side == "right":
-            ex, ey = target.right, target.center_y
-        elif to_side == "top":
-            ex, ey = target.center_x, target.top
-        else:  # bottom
-            ex, ey = target.center_x, target.bottom
-
+        sx, sy, ex, ey = _connection_points(source, target, from_side, to_side)
         elems = arrow(sx, sy, ex, ey, color=color, label=label)
-        self.elements.extend(elems)
+        self._extend(elems)
+
+    def arrows_between(
+        self,
+        sources: Sequence[Element],
+        targets: Sequence[Element],
+        labels: Optional[Sequence[Optional[str]]] = None,
+        color: str = "black",
+    ) -> None:
+        """Draw auto-routed arrows from each source to the matching target."""
+        if len(sources) != len(targets):
+            raise ValueError("sources and targets must have the same length")
+        if labels is None:
+            labels = [None] * len(sources)
+        elif len(labels) != len(sources):
+            raise ValueError("labels must match the number of arrows")
+
+        new_elements = []
+        for source, target, label in zip(sources, targets, labels):
+            sx, sy, ex, ey = _connection_points(source, target, "auto", "auto")
+            new_elements.extend(arrow(sx, sy, ex, ey, color=color, label=label))
+        self._extend(new_elements)
 
     def line_between(
         self,
@@ -521,22 +846,42 @@ class Diagram:
             target.center_x, target.center_y,
             color=color
         )
-        self.elements.append(elem)
+        self._append(elem)
+
+    def elements_of_type(self, elem_type: str) -> List[dict]:
+        """Return the elements of one type (e.g. "arrow"), in diagram order."""
+        return [elem for elem in self.elements if elem.get("type") == elem_type]
+
+    def translate(self, dx: float, dy: float) -> None:
+        """Move the whole diagram by (dx, dy).
+
+        Element handles returned by box()/boxes()/text_box() move with it, so
+        they can still be used for arrow_between() afterwards.
+        """
+        for elem in self.elements:
+            elem["x"] += dx
+            elem["y"] += dy
+        for handle in self._handles:
+            handle.x += dx
+            handle.y += dy
 
     def group(self, *elements: Element) -> str:
         """Group elements together. Returns group ID."""
         group_id = _gen_id()
         for elem in elements:
-            if "groupIds" not in self.elements[self._find_element_index(elem.id)]:
-                self.elements[self._find_element_index(elem.id)]["groupIds"] = []
-            self.elements[self._find_element_index(elem.id)]["groupIds"].append(group_id)
+            target = self.elements[self._find_element_index(elem.id)]
+            target.setdefault("groupIds", []).append(group_id)
         return group_id
 
     def _find_element_index(self, elem_id: str) -> int:
+        i = self._index.get(elem_id)
+        if i is not None and i < len(self.elements) and self.elements[i].get("id") == elem_id:
+            return i
+        # self.elements was modified directly; rebuild the index (first match wins)
+        self._index = {}
         for i, e in enumerate(self.elements):
-            if e.get("id") == elem_id:
-                return i
-        return -1
+            self._index.setdefault(e.get("id"), i)
+        return self._index.get(elem_id, -1)
 
     def to_dict(self) -> dict:
         """Export diagram as Excalidraw JSON dict."""
@@ -555,15 +900,57 @@ class Diagram:
         }
 
     def to_json(self, indent: int = 2) -> str:
-        """Export diagram as JSON string."""
+        """Export diagram as JSON string.
+
+        Uses orjson when installed. orjson only supports 2-space indentation,
+        so any other ``indent`` goes through the stdlib encoder.
+        """
+        if indent == 2:
+            return self._json_bytes().decode()
         return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
 
-    def save(self, path: Union[str, Path]) -> Path:
-        """Save diagram to file."""
+    def _json_bytes(self) -> bytes:
+        """2-space indented UTF-8 JSON of the current diagram state."""
+        if _HAS_ORJSON:
+            return orjson.dumps(
+                self.to_dict(),
+                default=_encode_default,
+                # NON_STR_KEYS: json.dumps also accepts int/float/bool/None keys
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+            )
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False).encode("utf-8")
+
+    def to_msgpack(self) -> bytes:
+        """Export diagram as MessagePack bytes (requires msgspec).
+
+        A compact binary alternative to to_json() for passing diagrams
+        between programs; Excalidraw itself only opens the JSON format.
+        """
+        if msgspec is None:
+            raise ImportError("to_msgpack() requires msgspec: pip install msgspec")
+        return msgspec.msgpack.encode(self.to_dict(), enc_hook=_encode_default)
+
+    def save(
+        self,
+        path: Union[str, Path],
+        format: Literal["json", "msgpack"] = "json",
+    ) -> Path:
+        """Save diagram to file.
+
+        ``format="msgpack"`` writes MessagePack (see to_msgpack()) and
+        defaults the extension to ``.mpk`` instead of ``.excalidraw``.
+        """
+        if format not in ("json", "msgpack"):
+            raise ValueError(f"Unknown format: {format!r}")
         path = Path(path)
         if not path.suffix:
-            path = path.with_suffix(".excalidraw")
-        path.write_text(self.to_json())
+            path = path.with_suffix(".mpk" if format == "msgpack" else ".excalidraw")
+        if format == "msgpack":
+            path.write_bytes(self.to_msgpack())
+        else:
+            # Encode once and write in one call; json.dump would issue a
+            # write() per chunk.
+            path.write_bytes(self._json_bytes())
         return path
 
 
@@ -611,6 +998,12 @@ class Flowchart(Diagram):
 
         return elem
 
+    def translate(self, dx: float, dy: float) -> None:
+        """Move the whole flowchart, including the next-node position."""
+        super().translate(dx, dy)
+        self._next_x += dx
+        self._next_y += dy
+
     def start(self, label: str = "Start") -> Element:
         """Add a start node (rounded rectangle)."""
         return self.node("__start__", label, shape="ellipse", color="green")
@@ -756,29 +1149,48 @@ def main():
 
     output_path = sys.argv[1]
 
-    # Read JSON from stdin if available
+    # Read JSON (or MessagePack, for programmatic callers) from stdin if available
     if not sys.stdin.isatty():
-        data = json.load(sys.stdin)
-        d = Diagram()
+        buf = sys.stdin.buffer.read()
+        # JSON objects/arrays (and empty input, for its error message) go to
+        # the JSON parser; anything else can only be MessagePack
+        is_json = buf.lstrip()[:1] in (b"", b"{", b"[")
+        if not is_json and msgspec is None:
+            print("Input is not JSON; MessagePack input requires msgspec: pip install msgspec")
+            sys.exit(1)
+        try:
+            if is_json:
+                data = orjson.loads(buf) if _HAS_ORJSON else json.loads(buf)
+            else:
+                data = msgspec.msgpack.decode(buf)
+        except ValueError as e:  # includes the orjson and msgspec decode errors
+            print(f"Invalid {'JSON' if is_json else 'MessagePack'} input: {e}")
+            sys.exit(1)
+        if not isinstance(data, dict):
+            print('Input must be an object like {"nodes": [...], "edges": [...]}')
+            sys.exit(1)
         # Process simple node/edge format
-        nodes = {}
-        for node in data.get("nodes", []):
-            elem = d.box(
-                node.get("x", 100),
-                node.get("y", 100),
-                node.get("label", "Node"),
-                color=node.get("color", "blue"),
-                shape=node.get("shape", "rectangle"),
-            )
-            nodes[node.get("id", node.get("label"))] = elem
-
-        for edge in data.get("edges", []):
-            source = nodes.get(edge.get("from"))
-            target = nodes.get(edge.get("to"))
-            if source and target:
-                d.arrow_between(source, target, label=edge.get("label"))
+        node_list = data.get("nodes", [])
+        node_index = {}
+        for i, node in enumerate(node_list):
+            node_index[node.get("id", node.get("label"))] = i
+        edges = [
+            edge for edge in data.get("edges", [])
+            if edge.get("from") in node_index and edge.get("to") in node_index
+        ]
+        d = Diagram.from_node_edge_arrays(
+            [node.get("x", 100) for node in node_list],
+            [node.get("y", 100) for node in node_list],
+            [node.get("label", "Node") for node in node_list],
+            colors=[node.get("color", "blue") for node in node_list],
+            shapes=[node.get("shape", "rectangle") for node in node_list],
+            edges_from=[node_index[edge.get("from")] for edge in edges],
+            edges_to=[node_index[edge.get("to")] for edge in edges],
+            edge_labels=[edge.get("label") for edge in edges],
+        )
 
-        d.save(output_path)
+        output_format = "msgpack" if output_path.endswith(".mpk") else "json"
+        d.save(output_path, format=output_format)
         print(f"Created: {output_path}")
     else:
         print("Provide JSON input via stdin")
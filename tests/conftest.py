@@ -0,0 +1,18 @@
+"""Shared fixtures for the Excalidraw generator tests."""
+
+import pytest
+
+from scripts.excalidraw_generator import Diagram
+
+# A standalone script against the live API (run it directly); importing it
+# without the anthropic package exits the interpreter.
+collect_ignore = ["test_api_skill.py"]
+
+
+@pytest.fixture(scope="module")
+def sample_diagram():
+    """A diagram with a single box. Shared per module, so treat it as read-only."""
+    d = Diagram()
+    d.box(0, 0, "Test")
+    return d
+
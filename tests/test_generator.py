@@ -1,16 +1,21 @@
-#!/usr/bin/env python3
 """Tests for the Excalidraw diagram generator."""
 
 import json
 import os
+import subprocess
 import sys
 import tempfile
 from pathlib import Path
 
-# Add scripts directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import pytest
 
-from excalidraw_generator import (
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+from scripts import excalidraw_generator
+from scripts.excalidraw_generator import (
     Diagram,
     Flowchart,
     ArchitectureDiagram,
@@ -25,62 +30,131 @@ from excalidraw_generator import (
 )
 
 
+def _is_hex_color(color: str) -> bool:
+    """True for "transparent" or a "#rrggbb" hex color."""
+    if color == "transparent":
+        return True
+    if len(color) != 7 or color[0] != "#":
+        return False
+    # bytes.fromhex validates the six digits in C; whitespace cannot sneak in
+    # because three bytes need all six characters to be hex digits.
+    try:
+        bytes.fromhex(color[1:])
+    except ValueError:
+        return False
+    return True
+
+
+# Fields every Excalidraw element must carry
+_REQUIRED_FIELDS = frozenset({
+    "id", "type", "x", "y", "width", "height",
+    "strokeColor", "backgroundColor", "fillStyle",
+    "strokeWidth", "strokeStyle", "roughness", "opacity",
+    "seed", "version", "versionNonce", "isDeleted", "groupIds",
+})
+
+
 class TestElementCreation:
     """Tests for individual element creation functions."""
 
-    def test_rectangle_basic(self):
-        elem = rectangle(100, 200, 150, 60)
-        assert elem["type"] == "rectangle"
-        assert elem["x"] == 100
-        assert elem["y"] == 200
-        assert elem["width"] == 150
-        assert elem["height"] == 60
+    @pytest.mark.parametrize(
+        "factory,elem_type,x,y,width,height",
+        [
+            pytest.param(rectangle, "rectangle", 100, 200, 150, 60, id="rectangle"),
+            pytest.param(ellipse, "ellipse", 50, 50, 100, 80, id="ellipse"),
+            pytest.param(diamond, "diamond", 0, 0, 120, 80, id="diamond"),
+        ],
+    )
+    def test_shape_basic(self, factory, elem_type, x, y, width, height):
+        elem = factory(x, y, width, height)
+        assert elem["type"] == elem_type
+        assert elem["x"] == x
+        assert elem["y"] == y
+        assert elem["width"] == width
+        assert elem["height"] == height
         assert elem["isDeleted"] is False
         assert "id" in elem
         assert "seed" in elem
 
-    def test_rectangle_with_color(self):
-        elem = rectangle(0, 0, 100, 100, color="blue", fill=True)
-        assert elem["strokeColor"] == COLORS["blue"]
-        assert elem["backgroundColor"] == COLORS["blue_bg"]
-
-    def test_rectangle_no_fill(self):
-        elem = rectangle(0, 0, 100, 100, color="red", fill=False)
-        assert elem["strokeColor"] == COLORS["red"]
-        assert elem["backgroundColor"] == "transparent"
-
-    def test_rectangle_rounded(self):
-        elem = rectangle(0, 0, 100, 100, rounded=True)
-        assert elem["roundness"] is not None
-        assert elem["roundness"]["type"] == 3
-
-    def test_rectangle_sharp(self):
-        elem = rectangle(0, 0, 100, 100, rounded=False)
-        assert elem["roundness"] is None
-
-    def test_ellipse_basic(self):
-        elem = ellipse(50, 50, 100, 80)
-        assert elem["type"] == "ellipse"
-        assert elem["x"] == 50
-        assert elem["y"] == 50
-
-    def test_diamond_basic(self):
-        elem = diamond(0, 0, 120, 80)
-        assert elem["type"] == "diamond"
-
-    def test_text_basic(self):
-        elem = text(100, 100, "Hello World")
+    @pytest.mark.parametrize(
+        "factory,color,fill,expected_stroke,expected_bg",
+        [
+            pytest.param(rectangle, "blue", True, COLORS["blue"], COLORS["blue_bg"], id="with_color"),
+            pytest.param(rectangle, "red", False, COLORS["red"], "transparent", id="no_fill"),
+            pytest.param(ellipse, "#123456", True, "#123456", "transparent", id="custom_hex"),
+        ],
+    )
+    def test_shape_colors(self, factory, color, fill, expected_stroke, expected_bg):
+        elem = factory(0, 0, 100, 100, color=color, fill=fill)
+        assert elem["strokeColor"] == expected_stroke
+        assert elem["backgroundColor"] == expected_bg
+
+    def test_palette_extended_at_runtime(self, monkeypatch):
+        monkeypatch.setitem(COLORS, "brand", "#123456")
+        monkeypatch.setitem(excalidraw_generator.BG_FOR_STROKE, "brand", "blue_bg")
+        d = Diagram()
+        d.box(0, 0, "A", color="brand")
+        shape, label = d.elements
+        assert shape["strokeColor"] == "#123456"
+        assert shape["backgroundColor"] == COLORS["blue_bg"]
+        assert label["strokeColor"] == "#123456"
+
+    @pytest.mark.parametrize(
+        "rounded,expected",
+        [
+            pytest.param(True, {"type": 3}, id="rounded"),
+            pytest.param(False, None, id="sharp"),
+        ],
+    )
+    def test_rectangle_roundness(self, rounded, expected):
+        elem = rectangle(0, 0, 100, 100, rounded=rounded)
+        assert elem["roundness"] == expected
+
+    def test_rectangle_roundness_not_shared(self):
+        a = rectangle(0, 0, 100, 100, rounded=True)
+        b = rectangle(0, 0, 100, 100, rounded=True)
+        a["roundness"]["type"] = 2
+        assert b["roundness"] == {"type": 3}
+        assert isinstance(b["roundness"], dict)
+
+    def test_elements_do_not_share_group_ids(self):
+        a = rectangle(0, 0, 10, 10)
+        b = rectangle(0, 0, 10, 10)
+        a["groupIds"].append("g1")
+        assert b["groupIds"] == []
+
+    @pytest.mark.parametrize("factory", [ellipse, diamond])
+    def test_shape_roundness_override(self, factory):
+        elem = factory(0, 0, 10, 10, roundness={"type": 2})
+        assert elem["roundness"] == {"type": 2}
+
+    @pytest.mark.parametrize("factory", [rectangle, ellipse, diamond])
+    def test_cached_template_matches_kwargs_path(self, factory):
+        per_item = ("id", "seed", "versionNonce")
+        fast = factory(5, 6, 70, 80, color="blue")
+        slow = factory(5, 6, 70, 80, color="blue", opacity=100)
+        assert list(fast) == list(slow)
+        assert {k: v for k, v in fast.items() if k not in per_item} == \
+            {k: v for k, v in slow.items() if k not in per_item}
+
+    @pytest.mark.parametrize(
+        "content,kwargs,expected_size,expected_family,expected_color",
+        [
+            pytest.param("Hello World", {}, 20, FONT_FAMILY["hand"], COLORS["black"], id="basic"),
+            pytest.param(
+                "Code", {"font_size": 16, "font_family": "code", "color": "violet"},
+                16, FONT_FAMILY["code"], COLORS["violet"], id="with_options",
+            ),
+        ],
+    )
+    def test_text(self, content, kwargs, expected_size, expected_family, expected_color):
+        elem = text(100, 100, content, **kwargs)
         assert elem["type"] == "text"
-        assert elem["text"] == "Hello World"
-        assert elem["originalText"] == "Hello World"
-        assert elem["fontSize"] == 20
-        assert elem["fontFamily"] == FONT_FAMILY["hand"]
-
-    def test_text_with_options(self):
-        elem = text(0, 0, "Code", font_size=16, font_family="code", color="violet")
-        assert elem["fontSize"] == 16
-        assert elem["fontFamily"] == FONT_FAMILY["code"]
-        assert elem["strokeColor"] == COLORS["violet"]
+        assert elem["text"] == content
+        assert elem["originalText"] == content
+        assert elem["fontSize"] == expected_size
+        assert elem["fontFamily"] == expected_family
+        assert elem["strokeColor"] == expected_color
 
     def test_text_multiline(self):
         elem = text(0, 0, "Line 1\nLine 2\nLine 3")
@@ -142,6 +216,14 @@ class TestDiagram:
         assert d.elements[0]["type"] == "rectangle"
         assert d.elements[1]["type"] == "text"
 
+    def test_element_handle(self):
+        d = Diagram()
+        elem = d.box(100, 50, "Test", width=200, height=80)
+        assert elem.id == d.elements[0]["id"]
+        assert (elem.center_x, elem.center_y) == (200, 90)
+        assert (elem.right, elem.bottom) == (300, 130)
+        assert not hasattr(elem, "__dict__")
+
     def test_diagram_box_shapes(self):
         d = Diagram()
         d.box(0, 0, "Rect", shape="rectangle")
@@ -151,6 +233,36 @@ class TestDiagram:
         assert d.elements[2]["type"] == "ellipse"
         assert d.elements[4]["type"] == "diamond"
 
+    def test_diagram_boxes(self):
+        d = Diagram()
+        elems = d.boxes([0, 200, 400], [0, 0, 100], ["A", "B", "C"], widths=[100, 120, 140])
+        assert [e.x for e in elems] == [0, 200, 400]
+        assert [e.width for e in elems] == [100, 120, 140]
+        assert all(e.height == 60 for e in elems)
+        # rect + text per box, in input order
+        assert len(d.elements) == 6
+        assert d.elements[1]["text"] == "A"
+        assert d.elements[5]["containerId"] == elems[2].id
+
+    def test_diagram_from_node_edge_arrays(self):
+        d = Diagram.from_node_edge_arrays(
+            [0, 300, 300], [0, 0, 200], ["A", "B", "C"],
+            colors=["blue", "green", "red"],
+            shapes=["rectangle", "ellipse", "diamond"],
+            edges_from=[0, 1], edges_to=[1, 2], edge_labels=["ab", None],
+            background="#f0f0f0",
+        )
+        assert d.background == "#f0f0f0"
+        types = [e["type"] for e in d.elements]
+        assert types[:6] == ["rectangle", "text", "ellipse", "text", "diamond", "text"]
+        assert types[6:] == ["arrow", "text", "arrow"]
+        assert d.elements[2]["strokeColor"] == COLORS["green"]
+
+    def test_diagram_boxes_length_mismatch(self):
+        d = Diagram()
+        with pytest.raises(ValueError):
+            d.boxes([0, 100], [0], ["A", "B"])
+
     def test_diagram_text_box(self):
         d = Diagram()
         elem = d.text_box(50, 50, "Standalone Text")
@@ -167,6 +279,23 @@ class TestDiagram:
         assert len(d.elements) == 5
         assert d.elements[4]["type"] == "arrow"
 
+    def test_diagram_arrow_between_auto_sides(self):
+        d = Diagram()
+        center = d.box(300, 300, "C", width=100, height=100)
+        cases = {
+            (600, 300): ((400, 350), (600, 350)),  # right -> left
+            (0, 300): ((300, 350), (100, 350)),    # left -> right
+            (300, 600): ((350, 400), (350, 600)),  # bottom -> top
+            (300, 0): ((350, 300), (350, 100)),    # top -> bottom
+        }
+        for (x, y), (start, end) in cases.items():
+            other = d.box(x, y, "O", width=100, height=100)
+            d.arrow_between(center, other)
+            arrow_elem = d.elements[-1]
+            dx, dy = arrow_elem["points"][1]
+            assert (arrow_elem["x"], arrow_elem["y"]) == start
+            assert (arrow_elem["x"] + dx, arrow_elem["y"] + dy) == end
+
     def test_diagram_arrow_between_with_label(self):
         d = Diagram()
         box1 = d.box(0, 0, "A")
@@ -175,10 +304,75 @@ class TestDiagram:
         # 2 boxes + arrow + label = 6 elements
         assert len(d.elements) == 6
 
-    def test_diagram_to_dict(self):
+    def test_diagram_arrows_between(self):
         d = Diagram()
-        d.box(0, 0, "Test")
-        result = d.to_dict()
+        a, b, c = d.boxes([0, 300, 0], [0, 0, 300], ["A", "B", "C"])
+        d.arrows_between([a, a], [b, c], labels=["right", None])
+        arrows = [e for e in d.elements[6:] if e["type"] == "arrow"]
+        assert len(arrows) == 2
+        # Same endpoints as the single-edge path
+        single = Diagram()
+        single.arrow_between(a, b)
+        single.arrow_between(a, c)
+        assert [e["x"] for e in arrows] == [e["x"] for e in single.elements]
+        assert [e["points"] for e in arrows] == [e["points"] for e in single.elements]
+        # One label element for the labelled arrow
+        assert len(d.elements) == 6 + 3
+
+    def test_diagram_group(self):
+        d = Diagram()
+        a = d.box(0, 0, "A")
+        b = d.box(200, 0, "B")
+        group_id = d.group(a, b)
+        assert d.elements[0]["groupIds"] == [group_id]
+        assert d.elements[2]["groupIds"] == [group_id]
+        assert d.elements[1]["groupIds"] == []
+
+    def test_diagram_group_after_direct_edit(self):
+        d = Diagram()
+        a = d.box(0, 0, "A")
+        # Bypass the Diagram API; group() must still find the element
+        d.elements.insert(0, rectangle(0, 0, 10, 10))
+        group_id = d.group(a)
+        assert d.elements[1]["groupIds"] == [group_id]
+        assert d.elements[0]["groupIds"] == []
+
+    def test_diagram_translate(self):
+        d = Diagram()
+        a = d.box(0, 0, "A")
+        b = d.box(300, 0, "B")
+        d.arrow_between(a, b)
+        before = [(e["x"], e["y"]) for e in d.elements]
+        d.translate(50, -20)
+        assert [(e["x"], e["y"]) for e in d.elements] == [(x + 50, y - 20) for x, y in before]
+        # Handles move too, so later arrows line up with the shapes
+        assert (a.x, a.y) == (50, -20)
+        d.arrow_between(a, b)
+        assert d.elements[-1]["x"] == d.elements[4]["x"]
+
+    def test_diagram_elements_of_type(self):
+        d = Diagram()
+        a = d.box(0, 0, "A")
+        b = d.box(300, 0, "B", shape="ellipse")
+        d.arrow_between(a, b, label="ab")
+        assert [e["id"] for e in d.elements_of_type("rectangle")] == [a.id]
+        assert len(d.elements_of_type("text")) == 3
+        assert d.elements_of_type("line") == []
+        # Direct edits to the list are picked up
+        d.elements.append(line(0, 0, 10, 10))
+        assert len(d.elements_of_type("line")) == 1
+        d.box(0, 300, "C")
+        assert len(d.elements_of_type("rectangle")) == 2
+        # ...including removals and in-place replacements
+        d.elements.pop()
+        d.box(0, 400, "D")
+        assert [e["text"] for e in d.elements_of_type("text")] == ["A", "B", "ab", "D"]
+        d.elements[0] = ellipse(0, 0, 10, 10)
+        assert len(d.elements_of_type("rectangle")) == 2
+        assert len(d.elements_of_type("ellipse")) == 2
+
+    def test_diagram_to_dict(self, sample_diagram):
+        result = sample_diagram.to_dict()
         assert result["type"] == "excalidraw"
         assert result["version"] == 2
         assert "elements" in result
@@ -186,25 +380,116 @@ class TestDiagram:
         assert "files" in result
         assert result["appState"]["viewBackgroundColor"] == "#ffffff"
 
-    def test_diagram_to_json(self):
-        d = Diagram()
-        d.box(0, 0, "Test")
-        json_str = d.to_json()
+    def test_diagram_to_json(self, sample_diagram):
+        json_str = sample_diagram.to_json()
         # Should be valid JSON
-        parsed = json.loads(json_str)
+        parsed = json_loads(json_str)
         assert parsed["type"] == "excalidraw"
 
-    def test_diagram_save(self):
+    def test_diagram_to_json_stdlib_fallback(self, monkeypatch):
         d = Diagram()
         d.box(0, 0, "Test")
+        fast = d.to_json()
+        monkeypatch.setattr(excalidraw_generator, "_HAS_ORJSON", False)
+        slow = d.to_json()
+        assert json_loads(fast) == json_loads(slow)
+        # Non-default indent always goes through the stdlib encoder
+        assert json_loads(d.to_json(indent=4)) == json_loads(slow)
+
+    def test_diagram_save_stdlib_fallback(self, monkeypatch):
+        d = Diagram()
+        d.box(0, 0, "日本語")
+        expected = json_loads(d.to_json())
+        monkeypatch.setattr(excalidraw_generator, "_HAS_ORJSON", False)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = d.save(os.path.join(tmpdir, "test"))
+            assert json_loads(path.read_bytes()) == expected
+
+    def test_diagram_to_json_float_subclass(self):
+        # e.g. numpy.float64 coordinates from a computed layout
+        class Coord(float):
+            pass
+
+        d = Diagram()
+        d.box(Coord(10.5), 0, "A")
+        assert json_loads(d.to_json())["elements"][0]["x"] == 10.5
+
+    def test_diagram_to_json_non_str_keys(self):
+        d = Diagram()
+        elem = rectangle(0, 0, 10, 10)
+        elem["customData"] = {1: "a"}
+        d.add(elem)
+        assert json_loads(d.to_json())["elements"][0]["customData"] == {"1": "a"}
+
+    def test_diagram_to_json_reflects_changes(self):
+        d = Diagram()
+        a = d.box(0, 0, "A")
+        first = d.to_json()
+        assert d.to_json() == first
+        d.box(200, 0, "B")
+        assert len(json_loads(d.to_json())["elements"]) == 4
+        d.translate(10, 0)
+        assert json_loads(d.to_json())["elements"][0]["x"] == 10
+        group_id = d.group(a)
+        assert json_loads(d.to_json())["elements"][0]["groupIds"] == [group_id]
+        d.elements.append(rectangle(0, 0, 10, 10))
+        assert len(json_loads(d.to_json())["elements"]) == 5
+        # Edits that bypass the Diagram methods show up too
+        a.data["strokeColor"] = "#000000"
+        assert json_loads(d.to_json())["elements"][0]["strokeColor"] == "#000000"
+        d.elements[-1] = ellipse(0, 0, 10, 10)
+        assert json_loads(d.to_json())["elements"][-1]["type"] == "ellipse"
+
+    def test_diagram_save_writes_current_state(self):
+        d = Diagram()
+        b = d.box(0, 0, "Test")
+        d.to_json()
+        b.data["strokeColor"] = "#000000"
         with tempfile.TemporaryDirectory() as tmpdir:
             path = d.save(os.path.join(tmpdir, "test"))
+            assert json_loads(path.read_bytes())["elements"][0]["strokeColor"] == "#000000"
+
+    def test_diagram_save(self):
+        d = Diagram()
+        d.box(0, 0, "Test")
+        with tempfile.NamedTemporaryFile(suffix=".excalidraw", delete=False) as tf:
+            pass
+        try:
+            # Save without the suffix; save() should add it back
+            path = d.save(Path(tf.name).with_suffix(""))
             assert path.suffix == ".excalidraw"
-            assert path.exists()
+            assert path == Path(tf.name)
             # Verify content
-            with open(path) as f:
-                data = json.load(f)
+            data = json_loads(path.read_bytes())
             assert data["type"] == "excalidraw"
+        finally:
+            os.unlink(tf.name)
+
+    def test_diagram_save_unknown_format(self):
+        d = Diagram()
+        with pytest.raises(ValueError):
+            d.save("unused", format="yaml")
+
+    @pytest.mark.skipif(excalidraw_generator.msgspec is None, reason="msgspec not installed")
+    def test_diagram_save_msgpack(self):
+        msgspec = excalidraw_generator.msgspec
+        d = Diagram()
+        d.box(0, 0, "Test")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = d.save(os.path.join(tmpdir, "test"), format="msgpack")
+            assert path.suffix == ".mpk"
+            data = msgspec.msgpack.decode(path.read_bytes())
+        assert data == json_loads(d.to_json())
+
+    @pytest.mark.skipif(excalidraw_generator.msgspec is None, reason="msgspec not installed")
+    def test_diagram_to_msgpack_float_subclass(self):
+        class Coord(float):
+            pass
+
+        d = Diagram()
+        d.box(Coord(10.5), 0, "A")
+        data = excalidraw_generator.msgspec.msgpack.decode(d.to_msgpack())
+        assert data["elements"][0]["x"] == 10.5
 
 
 class TestFlowchart:
@@ -260,6 +545,13 @@ class TestFlowchart:
         arrows = [e for e in fc.elements if e["type"] == "arrow"]
         assert len(arrows) == 1
 
+    def test_flowchart_translate(self):
+        fc = Flowchart(direction="vertical")
+        fc.process("p1", "One")
+        fc.translate(100, 0)
+        fc.process("p2", "Two")
+        assert fc._nodes["p1"].x == fc._nodes["p2"].x == 200
+
     def test_flowchart_position_at(self):
         fc = Flowchart()
         fc.position_at(500, 300)
@@ -320,10 +612,8 @@ class TestArchitectureDiagram:
 class TestExcalidrawFormat:
     """Tests for Excalidraw format compliance."""
 
-    def test_valid_excalidraw_structure(self):
-        d = Diagram()
-        d.box(0, 0, "Test")
-        data = d.to_dict()
+    def test_valid_excalidraw_structure(self, sample_diagram):
+        data = sample_diagram.to_dict()
         # Required top-level fields
         assert data["type"] == "excalidraw"
         assert data["version"] == 2
@@ -332,31 +622,52 @@ class TestExcalidrawFormat:
         assert isinstance(data["appState"], dict)
         assert isinstance(data["files"], dict)
 
-    def test_element_required_fields(self):
+    def test_element_required_fields(self, sample_diagram):
+        missing = _REQUIRED_FIELDS - sample_diagram.elements[0].keys()
+        assert not missing, f"Missing required fields: {sorted(missing)}"
+
+    # 1k boxes are 2k elements, enough to cross an ID pool refill
+    @pytest.mark.parametrize("n", [10, 100, 1000], ids=["10", "100", "1k"])
+    def test_unique_ids(self, n):
         d = Diagram()
-        d.box(0, 0, "Test")
-        elem = d.elements[0]
-        required_fields = [
-            "id", "type", "x", "y", "width", "height",
-            "strokeColor", "backgroundColor", "fillStyle",
-            "strokeWidth", "strokeStyle", "roughness", "opacity",
-            "seed", "version", "versionNonce", "isDeleted", "groupIds"
-        ]
-        for field in required_fields:
-            assert field in elem, f"Missing required field: {field}"
-
-    def test_unique_ids(self):
-        d = Diagram()
-        for i in range(10):
-            d.box(i * 100, 0, f"Box {i}")
-        ids = [e["id"] for e in d.elements]
-        assert len(ids) == len(set(ids)), "Element IDs must be unique"
-
-    def test_colors_are_valid_hex(self):
-        import re
-        hex_pattern = re.compile(r'^#[0-9a-fA-F]{6}$|^transparent$')
-        for name, color in COLORS.items():
-            assert hex_pattern.match(color), f"Invalid color format for {name}: {color}"
+        for i in range(n):
+            d.box(i * 100, 0, "Box")
+        assert len({e["id"] for e in d.elements}) == len(d.elements), "Element IDs must be unique"
+
+    def test_seeds_in_range_across_pool_refills(self):
+        seeds = [excalidraw_generator._gen_seed() for _ in range(2 * excalidraw_generator._SEED_POOL_SIZE + 1)]
+        assert all(1 <= s <= 2_000_000_000 for s in seeds)
+        assert len(set(seeds)) > len(seeds) // 2
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+    @pytest.mark.skipif(
+        excalidraw_generator._seeded_rng is not None,
+        reason="EXCALIDRAW_SEED makes a forked child repeat the parent's sequence",
+    )
+    def test_forked_child_gets_fresh_ids(self):
+        excalidraw_generator._gen_id()  # make sure the parent pool is filled
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # child
+            try:
+                os.close(read_fd)
+                os.write(write_fd, excalidraw_generator._gen_id().encode())
+            finally:
+                # Never return into pytest from the forked copy
+                os._exit(0)
+        os.close(write_fd)
+        child_id = os.read(read_fd, 64).decode()
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+        assert child_id != excalidraw_generator._gen_id()
+
+    @pytest.mark.parametrize("name,color", list(COLORS.items()))
+    def test_colors_are_valid_hex(self, name, color):
+        assert _is_hex_color(color), f"Invalid color format for {name}: {color}"
+
+    @pytest.mark.parametrize("color", ["#12345", "#1234567", "123456#", "#12345g", "#12 345", "blue"])
+    def test_hex_color_check_rejects_invalid(self, color):
+        assert not _is_hex_color(color)
 
 
 class TestEdgeCases:
@@ -399,54 +710,51 @@ class TestEdgeCases:
         assert elem["height"] == 0
 
 
-def run_tests():
-    """Run all tests and report results."""
-    import traceback
-
-    test_classes = [
-        TestElementCreation,
-        TestDiagram,
-        TestFlowchart,
-        TestArchitectureDiagram,
-        TestExcalidrawFormat,
-        TestEdgeCases,
-    ]
-
-    total = 0
-    passed = 0
-    failed = 0
-    errors = []
-
-    for test_class in test_classes:
-        instance = test_class()
-        for method_name in dir(instance):
-            if method_name.startswith("test_"):
-                total += 1
-                try:
-                    getattr(instance, method_name)()
-                    passed += 1
-                    print(f"  ✓ {test_class.__name__}.{method_name}")
-                except AssertionError as e:
-                    failed += 1
-                    errors.append((test_class.__name__, method_name, str(e), traceback.format_exc()))
-                    print(f"  ✗ {test_class.__name__}.{method_name}: {e}")
-                except Exception as e:
-                    failed += 1
-                    errors.append((test_class.__name__, method_name, str(e), traceback.format_exc()))
-                    print(f"  ✗ {test_class.__name__}.{method_name}: ERROR - {e}")
-
-    print(f"\n{'='*50}")
-    print(f"Results: {passed}/{total} passed, {failed} failed")
-
-    if errors:
-        print(f"\nFailures:")
-        for cls, method, msg, tb in errors:
-            print(f"\n{cls}.{method}:")
-            print(f"  {msg}")
-
-    return failed == 0
-
-
-if __name__ == "__main__":
-    success = run_tests()
-    sys.exit(0 if success else 1)
+class TestCLI:
+    """Tests for the stdin node/edge CLI."""
+
+    SCRIPT = str(Path(__file__).parent.parent / "scripts" / "excalidraw_generator.py")
+
+    def test_cli_json_stdin(self):
+        payload = {
+            "nodes": [{"id": "a", "label": "A"}, {"id": "b", "label": "B", "x": 300}],
+            "edges": [{"from": "a", "to": "b", "label": "next"}],
+        }
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = os.path.join(tmpdir, "out.excalidraw")
+            subprocess.run(
+                [sys.executable, self.SCRIPT, out],
+                input=json.dumps(payload).encode(), check=True, capture_output=True,
+            )
+            data = json_loads(Path(out).read_bytes())
+        types = [e["type"] for e in data["elements"]]
+        assert types == ["rectangle", "text", "rectangle", "text", "arrow", "text"]
+
+    @pytest.mark.parametrize(
+        "payload",
+        [b"", b"  \n", b"[1, 2]", b"{bad"],
+        ids=["empty", "whitespace", "array", "malformed"],
+    )
+    def test_cli_bad_input_exits_cleanly(self, payload):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = os.path.join(tmpdir, "out.excalidraw")
+            result = subprocess.run(
+                [sys.executable, self.SCRIPT, out], input=payload, capture_output=True,
+            )
+            assert not os.path.exists(out)
+        assert result.returncode == 1
+        assert b"Traceback" not in result.stderr
+
+    def test_cli_seeded_output_is_reproducible(self):
+        payload = json.dumps({"nodes": [{"id": "a", "label": "A"}]}).encode()
+        env = dict(os.environ, EXCALIDRAW_SEED="42")
+        outputs = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name in ("one", "two"):
+                out = os.path.join(tmpdir, f"{name}.excalidraw")
+                subprocess.run(
+                    [sys.executable, self.SCRIPT, out],
+                    input=payload, env=env, check=True, capture_output=True,
+                )
+                outputs.append(Path(out).read_bytes())
+        assert outputs[0] == outputs[1]